@@ -2,8 +2,6 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import numpy as np
 import scipy.io.wavfile as wav
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import threading
 import time
 import re
@@ -21,6 +19,22 @@ try:
 except ImportError:
     pass
 
+# Soundfile Check (streams float->PCM16 in C without an extra int16 copy)
+HAS_SOUNDFILE = False
+try:
+    import soundfile as sf
+    HAS_SOUNDFILE = True
+except ImportError:
+    pass
+
+# Fast JSON Check (orjson parses/serializes in C, stdlib json as fallback)
+HAS_ORJSON = False
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    pass
+
 # Smart Shift Mapping (Auto-correct numbers when Shift is held)
 SHIFT_MAP = {
     '!': '1', '"': '2', '§': '3', '$': '4', '%': '5',
@@ -28,8 +42,17 @@ SHIFT_MAP = {
     '@': '2', '#': '3', '^': '6', '*': '8', '+': '1'
 }
 
+# Single C-level translation replacing per-key str.replace loops on keystrokes
+_TRANS_UPPER = str.maketrans({**{c: c.upper() for c in 'abcdefghijklmnopqrstuvwxyz'}, **SHIFT_MAP})
+
 SETTINGS_FILE = "user_settings.json"
 
+# Strips anything that cannot be part of a callsign
+_TOKEN_STRIP = re.compile(r'[^A-Z0-9/]')
+
+# Candidate callsign token (compiled once, used on every RX line)
+_CALL_RE = re.compile(r'[A-Z0-9/]{3,}')
+
 class CosBitApp:
     def __init__(self, root):
         self.root = root
@@ -55,18 +78,39 @@ class CosBitApp:
         
         # --- Load Settings ---
         self.load_settings()
-        
+
+        # Device enumeration can take hundreds of ms per device on some
+        # backends, so query once at startup and refresh on demand.
+        self._devs = []
+        self._name_to_id = {}
+        if HAS_AUDIO:
+            self.refresh_devices()
+
+        # Live RX stream state (see listen_live)
+        self._rx_stream = None
+        self._rx_running = False
+        self._rx_lock = threading.Lock()
+
         self.setup_ui()
-        
+
         if not HAS_AUDIO:
             self.log("SYS: 'sounddevice' library not found. File mode only.", "SYS")
 
+    def refresh_devices(self):
+        """Re-queries audio devices and rebuilds the name->id cache."""
+        try:
+            self._devs = sd.query_devices()
+            self._name_to_id = {d['name']: i for i, d in enumerate(self._devs)}
+        except Exception:
+            self._devs = []
+            self._name_to_id = {}
+
     def load_settings(self):
         """Loads callsign and audio settings from JSON."""
         if os.path.exists(SETTINGS_FILE):
             try:
-                with open(SETTINGS_FILE, "r") as f:
-                    data = json.load(f)
+                with open(SETTINGS_FILE, "rb") as f:
+                    data = orjson.loads(f.read()) if HAS_ORJSON else json.loads(f.read())
                     self.var_my_call.set(data.get("my_call", "N0CALL"))
                     self.var_use_live.set(data.get("live_mode", False))
                     self.var_input_dev.set(data.get("input_dev", ""))
@@ -77,6 +121,7 @@ class CosBitApp:
 
     def on_close(self):
         """Saves settings on exit."""
+        self.stop_rx()
         data = {
             "my_call": self.var_my_call.get(),
             "live_mode": self.var_use_live.get(),
@@ -85,8 +130,11 @@ class CosBitApp:
             "tx_vol": self.var_tx_vol.get()
         }
         try:
-            with open(SETTINGS_FILE, "w") as f:
-                json.dump(data, f, indent=4)
+            with open(SETTINGS_FILE, "wb") as f:
+                if HAS_ORJSON:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+                else:
+                    f.write(json.dumps(data, indent=4).encode())
         except Exception as e:
             print(f"Could not save settings: {e}")
             
@@ -94,6 +142,11 @@ class CosBitApp:
         sys.exit()
 
     def setup_ui(self):
+        # Deferred import: matplotlib adds hundreds of ms to cold start, so
+        # pay that cost only when the UI actually builds the scope.
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         style = ttk.Style()
         style.theme_use('clam')
         
@@ -194,29 +247,48 @@ class CosBitApp:
         self.ax.set_xticks([])
         self.ax.set_yticks([])
         self.ax.grid(True, color="#333", linestyle="--", alpha=0.5)
-        
+
+        # Persistent artists: updating their data is much cheaper than
+        # ax.clear() + plot(), which rebuilds the whole axes every TX/RX.
+        self._scope_line, = self.ax.plot([], [], color=cfg.COLORS["text_tx"], lw=1)
+        self._thresh_line = self.ax.axhline(y=cfg.FREQ_THRESHOLD, color="red", alpha=0.5)
+        self._thresh_line.set_visible(False)
+
         self.canvas = FigureCanvasTkAgg(self.fig, master=tx_scope)
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
 
+    def update_scope(self, data, color, thresh=None):
+        """Redraws the scope by mutating the persistent line instead of re-plotting."""
+        self._scope_line.set_data(np.arange(len(data)), data)
+        self._scope_line.set_color(color)
+        if thresh is not None:
+            self._thresh_line.set_ydata([thresh, thresh])
+            self._thresh_line.set_visible(True)
+        else:
+            self._thresh_line.set_visible(False)
+        if len(data):
+            lo, hi = float(np.min(data)), float(np.max(data))
+            pad = (hi - lo) * 0.05 or 1.0
+            self.ax.set_xlim(0, len(data))
+            self.ax.set_ylim(lo - pad, hi + pad)
+        self.canvas.draw_idle()
+
     # --- Logic: Input Correction ---
     def auto_upper_correction(self, event):
         widget = event.widget
         text = widget.get()
-        new_text = text.upper()
-        for char, num in SHIFT_MAP.items():
-            new_text = new_text.replace(char, num)
-        if text != new_text:
-            pos = widget.index(tk.INSERT)
-            widget.delete(0, tk.END)
-            widget.insert(0, new_text)
-            widget.icursor(pos)
+        new_text = text.translate(_TRANS_UPPER)
+        if text == new_text:
+            return
+        pos = widget.index(tk.INSERT)
+        widget.delete(0, tk.END)
+        widget.insert(0, new_text)
+        widget.icursor(pos)
 
     def input_handler(self, event):
         content = self.txt_input.get("1.0", tk.END)
-        raw_content = content[:-1] 
-        new_content = raw_content.upper()
-        for char, num in SHIFT_MAP.items():
-            new_content = new_content.replace(char, num)
+        raw_content = content[:-1]
+        new_content = raw_content.translate(_TRANS_UPPER)
         if raw_content != new_content:
             self.txt_input.delete("1.0", tk.END)
             self.txt_input.insert("1.0", new_content)
@@ -258,17 +330,17 @@ class CosBitApp:
     def on_callsign_click(self, event):
         try:
             index = self.log_text.index(f"@{event.x},{event.y}")
-            line_start = f"{index} linestart"
-            line_end = f"{index} lineend"
-            word_start = self.log_text.search(r"\s|^", index, backwards=True, stopindex=line_start, regexp=True) 
-            if not word_start: word_start = line_start
-            else: word_start = f"{word_start}+1c"
-            word_end = self.log_text.search(r"\s|$", index, stopindex=line_end, regexp=True)
-            if not word_end: word_end = line_end
-            
-            clicked_word = self.log_text.get(word_start, word_end).strip()
-            clicked_word = re.sub(r'[^A-Z0-9/]', '', clicked_word.upper())
-            
+            col = int(index.split(".")[1])
+            line = self.log_text.get(f"{index} linestart", f"{index} lineend")
+
+            # Locate the token containing the clicked column arithmetically
+            # (no Tk regex search roundtrips)
+            start = line.rfind(" ", 0, col) + 1
+            end = line.find(" ", col)
+            if end == -1: end = len(line)
+
+            clicked_word = _TOKEN_STRIP.sub('', line[start:end].upper())
+
             if len(clicked_word) > 2:
                 self.var_dx_call.set(clicked_word)
                 self.entry_dx.config(bg="#444400")
@@ -280,15 +352,19 @@ class CosBitApp:
         self.log_text.insert(tk.END, f"{t} ", "SYS")
         
         if tag == "RX":
-            words = msg.split(" ")
-            for word in words:
-                clean = re.sub(r'[^A-Z0-9/]', '', word.upper())
-                if re.match(r'[A-Z0-9/]{3,}', clean) and any(c.isdigit() for c in clean):
-                    self.log_text.insert(tk.END, word + " ", "CLICKABLE")
-                else:
-                    self.log_text.insert(tk.END, word + " ", "RX")
-            self.log_text.insert(tk.END, "\n")
-            
+            # Build the whole line plus clickable spans first, then insert once:
+            # per-word inserts trigger a Tk reflow each. Callsign candidates are
+            # found in one linear regex pass over the message.
+            spans = []
+            for match in _CALL_RE.finditer(msg.upper()):
+                if any(c.isdigit() for c in match.group()):
+                    spans.append((match.start(), match.end()))
+            line_start = self.log_text.index("end-1c")
+            self.log_text.insert(tk.END, msg + " \n", "RX")
+            for s, e in spans:
+                self.log_text.tag_add("CLICKABLE", f"{line_start}+{s}c", f"{line_start}+{e}c")
+
+
             my_call = self.var_my_call.get().strip().upper()
             if my_call and my_call in msg.upper():
                 self.trigger_alert()
@@ -298,14 +374,16 @@ class CosBitApp:
         self.log_text.see(tk.END)
 
     def trigger_alert(self):
-        def flash():
-            for _ in range(6):
-                bg = "#aa0000" if _ % 2 == 0 else "#222"
-                fg = "white" if _ % 2 == 0 else "#666"
+        # Flash via Tk's own scheduler: widgets must not be touched off-thread
+        def step(i):
+            if i < 6:
+                bg = "#aa0000" if i % 2 == 0 else "#222"
+                fg = "white" if i % 2 == 0 else "#666"
                 self.lbl_status.config(text="!!! INCOMING CALL !!!", bg=bg, fg=fg)
-                time.sleep(0.15)
-            self.lbl_status.config(text="SYSTEM READY", bg="#222", fg="#666")
-        threading.Thread(target=flash).start()
+                self.root.after(150, lambda: step(i + 1))
+            else:
+                self.lbl_status.config(text="SYSTEM READY", bg="#222", fg="#666")
+        step(0)
 
     def tx_process(self):
         text = self.txt_input.get("1.0", tk.END).strip()
@@ -317,20 +395,21 @@ class CosBitApp:
         self.log(f"TX > {text}", "SYS")
         try:
             audio = self.modem.modulate(text, amplitude=vol)
-            
-            self.ax.clear()
-            self.ax.set_facecolor('black')
-            self.ax.grid(True, color="#333", linestyle="--")
-            self.ax.set_xticks([]); self.ax.set_yticks([])
-            self.ax.plot(audio[:4000], color=cfg.COLORS["text_tx"], lw=1)
-            self.canvas.draw()
-            
+
+            self.update_scope(audio[:4000], cfg.COLORS["text_tx"])
+
             if self.var_use_live.get() and HAS_AUDIO:
                 dev_id = self.get_device_id(self.var_output_dev.get(), 'output')
                 if dev_id == -1: return
-                sd.play(audio.astype(np.float32), samplerate=cfg.SAMPLE_RATE, device=dev_id)
+                # Keep audio I/O off the Tk main thread
+                def player():
+                    sd.play(audio.astype(np.float32), samplerate=cfg.SAMPLE_RATE, device=dev_id)
+                threading.Thread(target=player).start()
             else:
-                wav.write("tx_output.wav", cfg.SAMPLE_RATE, (audio * 32767).astype(np.int16))
+                if HAS_SOUNDFILE:
+                    sf.write("tx_output.wav", audio, cfg.SAMPLE_RATE, subtype='PCM_16')
+                else:
+                    wav.write("tx_output.wav", cfg.SAMPLE_RATE, (audio * 32767).astype(np.int16))
                 self.log("Saved 'tx_output.wav'", "SYS")
         except Exception as e:
             messagebox.showerror("TX Error", str(e))
@@ -350,17 +429,83 @@ class CosBitApp:
                 self.log(f"Err: {e}", "SYS")
 
     def listen_live(self):
+        """Starts (or stops) continuous RX via a streamed ring buffer.
+
+        Instead of recording a fixed 10 s block, audio is streamed in 4096-sample
+        callbacks into a preallocated ring. A worker thread scans the ring for a
+        sync marker as data arrives, so packets are decoded with sub-second
+        latency and cannot be lost across capture boundaries.
+        """
+        if self._rx_running:
+            self.stop_rx()
+            return
         dev_id = self.get_device_id(self.var_input_dev.get(), 'input')
         if dev_id == -1:
             self.log("RX Device Error", "SYS")
             return
-        self.lbl_status.config(text="LISTENING (10s)...", fg="yellow")
-        self.root.update()
-        def runner():
-            rec = sd.rec(int(10 * cfg.SAMPLE_RATE), samplerate=cfg.SAMPLE_RATE, channels=1, device=dev_id, dtype='float32')
-            sd.wait()
-            self.root.after(0, lambda: self.process_audio(rec.flatten()))
-        threading.Thread(target=runner).start()
+
+        ring_len = 4 * cfg.SAMPLE_RATE  # ~3x the packet duration
+        self._ring = np.zeros(ring_len, dtype=np.float32)
+        self._ring_head = 0
+        self._ring_new = 0
+        self._rx_running = True
+
+        def callback(indata, frames, t, status):
+            data = indata[:, 0]
+            with self._rx_lock:
+                end = self._ring_head + len(data)
+                if end <= ring_len:
+                    self._ring[self._ring_head:end] = data
+                else:
+                    split = ring_len - self._ring_head
+                    self._ring[self._ring_head:] = data[:split]
+                    self._ring[:end - ring_len] = data[split:]
+                self._ring_head = end % ring_len
+                self._ring_new += len(data)
+
+        def scanner():
+            # Rescan once per ~0.25 s of new audio
+            scan_step = cfg.SAMPLE_RATE // 4
+            while self._rx_running:
+                time.sleep(0.1)
+                with self._rx_lock:
+                    if self._ring_new < scan_step:
+                        continue
+                    self._ring_new = 0
+                    head = self._ring_head
+                    snapshot = np.concatenate((self._ring[head:], self._ring[:head]))
+                result = self.modem.demodulate(snapshot, threshold_override=self.var_rx_thresh.get())
+                if result and result['success']:
+                    with self._rx_lock:
+                        self._ring[:] = 0  # consume, avoid re-decoding the same packet
+                    self.root.after(0, lambda r=result: self.on_live_decode(r))
+
+        try:
+            self._rx_stream = sd.InputStream(samplerate=cfg.SAMPLE_RATE, blocksize=4096,
+                                             channels=1, device=dev_id, dtype='float32',
+                                             callback=callback)
+            self._rx_stream.start()
+        except Exception as e:
+            self._rx_running = False
+            self.log(f"RX Stream Error: {e}", "SYS")
+            return
+        threading.Thread(target=scanner, daemon=True).start()
+        self.lbl_status.config(text="LIVE RX ACTIVE (click again to stop)", fg="yellow")
+
+    def stop_rx(self):
+        self._rx_running = False
+        if self._rx_stream:
+            try:
+                self._rx_stream.stop()
+                self._rx_stream.close()
+            except Exception: pass
+            self._rx_stream = None
+        self.lbl_status.config(text="SYSTEM READY", bg="#222", fg="#666")
+
+    def on_live_decode(self, result):
+        self.log(result['text'], "RX")
+        self.lbl_status.config(text="CRC VALID - LIVE RX ACTIVE", fg="#00ff00")
+        self.update_scope(result['freq_viz'], cfg.COLORS["text_rx"], thresh=self.var_rx_thresh.get())
 
     def process_audio(self, data):
         self.lbl_status.config(text="DECODING...", fg="cyan")
@@ -370,25 +515,18 @@ class CosBitApp:
         if result and result['success']:
             self.log(result['text'], "RX")
             self.lbl_status.config(text="CRC VALID", fg="#00ff00")
-            self.ax.clear()
-            self.ax.set_facecolor('black')
-            self.ax.grid(True, color="#333", linestyle="--")
-            self.ax.plot(result['freq_viz'], color=cfg.COLORS["text_rx"], lw=1)
-            self.ax.axhline(y=thresh, color="red", alpha=0.5)
-            self.canvas.draw()
+            self.update_scope(result['freq_viz'], cfg.COLORS["text_rx"], thresh=thresh)
         else:
             self.log("Signal Error / Noise", "SYS")
             self.lbl_status.config(text="SYNC ERROR", fg="red")
 
     def get_device_id(self, name, kind='input'):
         if not name: return -1
-        try:
-            devs = sd.query_devices()
-            for i, d in enumerate(devs):
-                if d['name'] == name:
-                    if kind == 'input' and d['max_input_channels'] > 0: return i
-                    if kind == 'output' and d['max_output_channels'] > 0: return i
-        except: pass
+        i = self._name_to_id.get(name, -1)
+        if i == -1: return -1
+        d = self._devs[i]
+        if kind == 'input' and d['max_input_channels'] > 0: return i
+        if kind == 'output' and d['max_output_channels'] > 0: return i
         return -1
 
     def open_settings_window(self):
@@ -407,19 +545,24 @@ class CosBitApp:
         frm.pack(fill="x", padx=10)
         tk.Checkbutton(frm, text="Live Audio Mode", variable=self.var_use_live, bg="#333", fg="white", selectcolor="black").pack(anchor="w")
         
-        devs = sd.query_devices()
-        ins = list(set([d['name'] for d in devs if d['max_input_channels'] > 0]))
-        outs = list(set([d['name'] for d in devs if d['max_output_channels'] > 0]))
-        
+        ins = list(set([d['name'] for d in self._devs if d['max_input_channels'] > 0]))
+        outs = list(set([d['name'] for d in self._devs if d['max_output_channels'] > 0]))
+
         lbl("Input Device:").pack()
         cb_in = ttk.Combobox(win, values=ins, textvariable=self.var_input_dev)
         cb_in.pack(fill="x", padx=20)
         lbl("Output Device:").pack()
         cb_out = ttk.Combobox(win, values=outs, textvariable=self.var_output_dev)
         cb_out.pack(fill="x", padx=20)
-        
+
         if not self.var_input_dev.get() and ins: cb_in.current(0)
         if not self.var_output_dev.get() and outs: cb_out.current(0)
+
+        def do_refresh():
+            self.refresh_devices()
+            cb_in['values'] = list(set([d['name'] for d in self._devs if d['max_input_channels'] > 0]))
+            cb_out['values'] = list(set([d['name'] for d in self._devs if d['max_output_channels'] > 0]))
+        tk.Button(win, text="REFRESH DEVICES", bg="#444", fg="white", command=do_refresh).pack(pady=(10, 0))
         
         lbl("TX Volume:").pack(pady=(10,0))
         tk.Scale(win, from_=0, to=1, resolution=0.1, orient="horizontal", variable=self.var_tx_vol, bg="#222", fg="white").pack(fill="x", padx=20)
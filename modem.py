@@ -3,13 +3,83 @@ import scipy.signal as signal
 from reedsolo import RSCodec, ReedSolomonError
 import config as cfg
 
+# Numba JIT Check (optional speedup, NumPy fallback below)
+HAS_NUMBA = False
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    pass
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _goertzel_powers_jit(frames, coef_mark, coef_space):
+        """MARK/SPACE tone powers per bit window, both Goertzel filters in one pass."""
+        num_bits, n_samples = frames.shape
+        p_mark = np.empty(num_bits)
+        p_space = np.empty(num_bits)
+        for i in prange(num_bits):
+            s1m = 0.0; s2m = 0.0
+            s1s = 0.0; s2s = 0.0
+            for n in range(n_samples):
+                x = frames[i, n]
+                s0 = x + coef_mark * s1m - s2m
+                s2m = s1m; s1m = s0
+                s0 = x + coef_space * s1s - s2s
+                s2s = s1s; s1s = s0
+            p_mark[i] = s1m * s1m + s2m * s2m - coef_mark * s1m * s2m
+            p_space[i] = s1s * s1s + s2s * s2s - coef_space * s1s * s2s
+        return p_mark, p_space
+
+    @njit(cache=True)
+    def _bytes_to_freqs_jit(encoded, spb, f_mark, f_space):
+        """RS-encoded bytes -> interleaved, sample-expanded frequency array in one pass."""
+        n = encoded.shape[0]
+        out = np.empty(n * 8 * spb, dtype=np.float32)
+        idx = 0
+        for col in range(8):
+            for r in range(n):
+                bit = (encoded[r] >> (7 - col)) & 1
+                f = f_mark if bit else f_space
+                for _ in range(spb):
+                    out[idx] = f
+                    idx += 1
+        return out
+
 class CosBitModem:
+    # Tolerated bit errors inside the sync marker
+    SYNC_MAX_ERRORS = 2
+
     def __init__(self):
         # Initialize Reed-Solomon Codec
         self.rsc = RSCodec(cfg.ECC_BYTES)
+        # Sync pattern as +/-1 correlation template (matched filter)
+        sync_bits = np.frombuffer(cfg.SYNC_PATTERN.encode('ascii'), dtype=np.uint8) & 1
+        self._sync_template = sync_bits.astype(np.int8) * 2 - 1
+        # Start-Chirp is invariant -> compute once (unscaled, amplitude applied per TX)
+        chirp_len = int(cfg.SAMPLE_RATE * 0.1)
+        t_chirp = np.linspace(0, 0.1, chirp_len)
+        self._chirp = signal.chirp(t_chirp, 800, 0.1, 1500).astype(np.float32)
+        # Shape-invariant constants, hoisted out of modulate/demodulate
+        self._spb = cfg.SAMPLE_RATE // cfg.BAUD_RATE
+        self._fs_dec = cfg.SAMPLE_RATE // 4
+        self._spb_dec = self._fs_dec // cfg.BAUD_RATE
+        self._coef_mark = np.float32(2.0 * np.cos(2.0 * np.pi * cfg.FREQ_MARK / self._fs_dec))
+        self._coef_space = np.float32(2.0 * np.cos(2.0 * np.pi * cfg.FREQ_SPACE / self._fs_dec))
+        self._freq_map = np.array([cfg.FREQ_SPACE, cfg.FREQ_MARK], dtype=np.float32)
+        self._prefix_bits = np.frombuffer(("1010" * 20 + cfg.SYNC_PATTERN).encode('ascii'),
+                                          dtype=np.uint8) & 1
+        self._tail_bits = np.zeros(20, dtype=np.uint8)
+        # Preamble/sync and tail never change -> expand to frequencies once
+        self._prefix_freqs = self._freq_map[self._prefix_bits].repeat(self._spb)
+        self._tail_freqs = self._freq_map[self._tail_bits].repeat(self._spb)
+        # Scratch buffers for the fixed-size TX bit pipeline (no per-packet allocs)
+        self._bit_scratch = np.empty(cfg.TOTAL_PACKET_BYTES * 8, dtype=np.uint8)
+        self._bit_scratch2 = np.empty_like(self._bit_scratch)
+        self._bit_shifts = np.arange(7, -1, -1, dtype=np.uint8)
 
-    def text_to_bits_robust(self, text):
-        """Converts text to protected, interleaved bits."""
+    def _encode_packet(self, text):
+        """Pads text to the fixed packet size and RS-encodes it, as a uint8 array."""
         # 1. Padding (Force fixed length)
         data_bytes = text.encode('utf-8')
         if len(data_bytes) > cfg.DATA_BYTES:
@@ -17,28 +87,35 @@ class CosBitModem:
         else:
             padding = cfg.DATA_BYTES - len(data_bytes)
             data_bytes += b'\x00' * padding
-        
+
         # 2. RS Encoding (Add Error Correction Codes)
-        encoded_bytes = self.rsc.encode(data_bytes)
-        
-        # 3. Convert Bytes to Bits string
-        bits = "".join(format(byte, '08b') for byte in encoded_bytes)
-        
-        # 4. Matrix Interleaving
-        return self._interleave_bits(bits)
+        return np.frombuffer(bytes(self.rsc.encode(data_bytes)), dtype=np.uint8)
+
+    def text_to_bits_robust(self, text):
+        """Converts text to protected, interleaved bits.
+
+        Returns a reused scratch buffer: valid until the next call.
+        """
+        encoded = self._encode_packet(text)
+
+        # 3. Convert Bytes to Bits, unpacked into the scratch buffer
+        # (np.unpackbits has no out=, so shift/mask in place instead)
+        matrix = self._bit_scratch.reshape(-1, 8)
+        np.right_shift(encoded[:, None], self._bit_shifts, out=matrix)
+        matrix &= 1
+
+        # 4. Matrix Interleaving (strided copy straight into the second buffer)
+        self._bit_scratch2.reshape(8, -1)[:] = matrix.T
+        return self._bit_scratch2
 
     def bits_to_text_robust(self, bits):
         """Decodes bits, de-interleaves, and repairs errors."""
         # 1. De-Interleaving
         deinterleaved = self._deinterleave_bits(bits)
-        
+
         # 2. Bits to Bytes
-        byte_array = bytearray()
-        for i in range(0, len(deinterleaved), 8):
-            chunk = deinterleaved[i:i+8]
-            if len(chunk) < 8: break
-            byte_array.append(int(chunk, 2))
-            
+        byte_array = bytearray(np.packbits(deinterleaved))
+
         # 3. RS Decoding & Repair
         try:
             decoded_with_padding = self.rsc.decode(byte_array)[0]
@@ -49,88 +126,121 @@ class CosBitModem:
 
     def modulate(self, text, amplitude=0.5):
         """Generates the AFSK audio signal."""
-        preamble = "1010" * 20 
-        payload_bits = self.text_to_bits_robust(text)
-        full_bitstream = preamble + cfg.SYNC_PATTERN + payload_bits + "0" * 20 
-        
-        samples_per_bit = int(cfg.SAMPLE_RATE / cfg.BAUD_RATE)
-        
-        # Expand bits to audio samples
-        bit_array = np.array([int(b) for b in full_bitstream])
-        repeated_bits = np.repeat(bit_array, samples_per_bit)
-        
-        # Map frequencies
-        freqs = np.where(repeated_bits == 1, cfg.FREQ_MARK, cfg.FREQ_SPACE)
-        
-        # Integrate phase (Continuous Phase Audio)
-        phase = 2 * np.pi * np.cumsum(freqs) / cfg.SAMPLE_RATE
-        audio = np.sin(phase) * amplitude 
-        
-        # Start-Chirp (Acoustic marker)
-        chirp_len = int(cfg.SAMPLE_RATE * 0.1)
-        t_chirp = np.linspace(0, 0.1, chirp_len)
-        chirp = signal.chirp(t_chirp, 800, 0.1, 1500) * (amplitude * 0.8)
-        
-        return np.concatenate((chirp, np.zeros(1000), audio, np.zeros(2000)))
+        # Payload bits -> frequencies. The JIT kernel fuses unpack, interleave,
+        # frequency map and sample expansion into one pass over memory.
+        # float32 throughout: AFSK needs no double precision and the half-size
+        # buffers cut memory traffic on every stage below.
+        if HAS_NUMBA:
+            encoded = self._encode_packet(text)
+            payload_freqs = _bytes_to_freqs_jit(encoded, self._spb,
+                                                np.float32(cfg.FREQ_MARK), np.float32(cfg.FREQ_SPACE))
+        else:
+            payload_bits = self.text_to_bits_robust(text)
+            payload_freqs = self._freq_map[payload_bits].repeat(self._spb)
+        freqs = np.concatenate((self._prefix_freqs, payload_freqs, self._tail_freqs))
+
+        # Integrate phase (Continuous Phase Audio), sine computed in-place
+        phase = np.cumsum(freqs, dtype=np.float32)
+        phase *= np.float32(2 * np.pi / cfg.SAMPLE_RATE)
+        audio = np.empty_like(phase)
+        np.sin(phase, out=audio)
+        audio *= np.float32(amplitude)
+
+        # Assemble chirp + gap + payload + tail into one preallocated buffer
+        chirp_len = len(self._chirp)
+        out = np.zeros(chirp_len + 1000 + len(audio) + 2000, dtype=np.float32)
+        out[:chirp_len] = self._chirp
+        out[:chirp_len] *= amplitude * 0.8
+        out[chirp_len + 1000 : chirp_len + 1000 + len(audio)] = audio
+        return out
 
     def demodulate(self, audio_data, threshold_override=None):
         """Searches for signals and decodes them."""
-        if len(audio_data) == 0: return None
-        
-        # 1. Hilbert Transform (Instantaneous Frequency)
-        analytic_signal = signal.hilbert(audio_data)
-        inst_phase = np.unwrap(np.angle(analytic_signal))
-        inst_freq = (np.diff(inst_phase) / (2.0 * np.pi) * cfg.SAMPLE_RATE)
-        
-        # Filtering
-        sos = signal.butter(4, cfg.BAUD_RATE*1.5, 'low', fs=cfg.SAMPLE_RATE, output='sos')
-        freq_clean = signal.sosfilt(sos, inst_freq)
-        
-        # Digitization
+        # Too short to contain a sync marker (also keeps decimate's filter happy)
+        if len(audio_data) < 1024: return None
+
+        # 0. Downsample 4x: tones are <= 2 kHz, so 12 kHz is still >= 5x Nyquist
+        # and every later stage touches a quarter of the samples.
+        audio_data = signal.decimate(audio_data, 4, ftype='fir', zero_phase=True).astype(np.float32)
+
         thresh = threshold_override if threshold_override is not None else cfg.FREQ_THRESHOLD
-        digital_stream = np.where(freq_clean > thresh, 1, 0)
-        
-        # 2. Sampling (Read Bits)
-        samples_per_bit = int(cfg.SAMPLE_RATE / cfg.BAUD_RATE)
-        bits_list = []
-        for i in range(samples_per_bit // 2, len(digital_stream), samples_per_bit):
-            bits_list.append(str(int(digital_stream[i])))
-        bits_str = "".join(bits_list)
-            
-        # 3. Sync Search
-        idx = bits_str.find(cfg.SYNC_PATTERN)
-        if idx != -1:
-            payload_start = idx + len(cfg.SYNC_PATTERN)
+        samples_per_bit = self._spb_dec
+        coef_mark = self._coef_mark
+        coef_space = self._coef_space
+
+        # 1. Goertzel Tone Detection, one window per bit cell.
+        # The bit-cell boundary is unknown, so try a few window phase offsets
+        # and keep the alignment with the strongest sync correlation.
+        best_score, best_idx, best_sampled, best_freq = -1, -1, None, None
+        for offset in range(0, samples_per_bit, max(1, samples_per_bit // 8)):
+            num_bits = (len(audio_data) - offset) // samples_per_bit
+            if num_bits < len(cfg.SYNC_PATTERN):
+                continue
+            frames = audio_data[offset : offset + num_bits * samples_per_bit]
+            frames = frames.reshape(num_bits, samples_per_bit)
+            if HAS_NUMBA:
+                p_mark, p_space = _goertzel_powers_jit(frames, coef_mark, coef_space)
+            else:
+                p_mark = self._goertzel_power(frames, coef_mark)
+                p_space = self._goertzel_power(frames, coef_space)
+
+            # Soft frequency estimate per bit (keeps the threshold meaningful)
+            total = np.maximum(p_mark + p_space, 1e-12)
+            freq_est = (p_mark * cfg.FREQ_MARK + p_space * cfg.FREQ_SPACE) / total
+            sampled = (freq_est > thresh).astype(np.uint8)
+
+            idx, score = self._find_sync(sampled)
+            if idx != -1 and score > best_score:
+                best_score, best_idx, best_sampled, best_freq = score, idx, sampled, freq_est
+                if score == len(cfg.SYNC_PATTERN):
+                    break
+
+        # 2. Extract & Decode Payload
+        if best_idx != -1:
+            payload_start = best_idx + len(cfg.SYNC_PATTERN)
             expected_bits = cfg.TOTAL_PACKET_BYTES * 8
-            
-            if payload_start + expected_bits <= len(bits_str):
-                raw_payload_bits = bits_str[payload_start : payload_start + expected_bits]
+
+            if payload_start + expected_bits <= len(best_sampled):
+                raw_payload_bits = best_sampled[payload_start : payload_start + expected_bits]
                 text, success = self.bits_to_text_robust(raw_payload_bits)
-                
+
                 return {
                     "text": text,
                     "success": success,
-                    "freq_viz": freq_clean[idx*samples_per_bit : (idx+300)*samples_per_bit]
+                    "freq_viz": best_freq[best_idx : best_idx + 300]
                 }
         return None
 
-    def _interleave_bits(self, bits):
-        cols = 8 
-        rows = len(bits) // cols
-        interleaved = ""
-        for c in range(cols):
-            for r in range(rows):
-                interleaved += bits[r * cols + c]
-        return interleaved
+    def _goertzel_power(self, frames, coef):
+        """Tone power per bit window via the Goertzel recurrence (vectorized over rows)."""
+        s1 = np.zeros(len(frames), dtype=frames.dtype)
+        s2 = np.zeros(len(frames), dtype=frames.dtype)
+        for n in range(frames.shape[1]):
+            s0 = frames[:, n] + coef * s1 - s2
+            s2 = s1
+            s1 = s0
+        return s1 * s1 + s2 * s2 - coef * s1 * s2
+
+    def _find_sync(self, sampled):
+        """Locates SYNC_PATTERN in a sampled bit array, allowing SYNC_MAX_ERRORS bit errors.
+
+        Returns (index, correlation score); index is -1 if no match passed the threshold.
+        """
+        sync = self._sync_template
+        if len(sampled) < len(sync):
+            return -1, 0
+        signed = sampled.astype(np.int8) * 2 - 1
+        corr = np.convolve(signed, sync[::-1], mode='valid')
+        idx = int(np.argmax(corr))
+        score = int(corr[idx])
+        # Each flipped bit costs 2 correlation points
+        if score >= len(sync) - 2 * self.SYNC_MAX_ERRORS:
+            return idx, score
+        return -1, score
 
     def _deinterleave_bits(self, bits):
+        # Undoes the TX matrix interleave (bit c of byte r -> position r*8+c)
+        # as a reshape+transpose: a single contiguous C copy.
         cols = 8
         rows = len(bits) // cols
-        original = [""] * len(bits)
-        idx = 0
-        for c in range(cols):
-            for r in range(rows):
-                if idx < len(bits):
-                    original[r * cols + c] = bits[idx]
-                    idx += 1
-        return "".join(original)
\ No newline at end of file
+        return bits.reshape(cols, rows).T.reshape(-1)
\ No newline at end of file